@@ -1,7 +1,11 @@
+import threading
 from tkinter import *
-from utils.currencyMap import CURRENCY_MAP
+from utils.currencyMap import CURRENCY_MAP, formatAmount
 from utils.getSkins import getPrice
 
+# The currency names shown in the dropdown
+CURRENCY_OPTIONS = tuple(CURRENCY_MAP)
+
 
 class Window(Frame):
     """Frame displaying all of the info."""
@@ -12,19 +16,13 @@ class Window(Frame):
         self.master = master
         self.pack(fill=BOTH, expand=1)
         
-        # Get the current skin price
-        try:
-            self.amount = getPrice()
-        except Exception as e:
-            self.amount = 0
-            print(f"Error getting skin price: {e}")
+        # The skin price is fetched in the background once the window is up
+        self.amount = None
         
         # Create the currency menu
         self.menu = StringVar()
         self.menu.set("United States Dollar ($)")
-        self.menu.trace_add("write", self.updateLabel)  
-        options = list(CURRENCY_MAP.keys())
-        currency = OptionMenu(self, self.menu, *options)
+        currency = OptionMenu(self, self.menu, *CURRENCY_OPTIONS, command=self.updateLabel)
         currency.config(width=25, bg="#444444", fg="#FFFFFF", activebackground="#555555", activeforeground="#FFFFFF", highlightthickness=0)
         currency["menu"].config(bg="#444444", fg="#FFFFFF")
         
@@ -39,19 +37,39 @@ class Window(Frame):
         self.text.pack(side=TOP, pady=10)
         currency.pack(side=TOP, pady=10)
         quit_button.pack(side=BOTTOM, pady=10)
+        
+        # Get the current skin price without blocking the window from showing
+        threading.Thread(target=self.fetchPrice, daemon=True).start()
+    
+    
+    def fetchPrice(self):
+        """Get the current skin price off the Tk thread."""
+        try:
+            amount = getPrice()
+        except Exception as e:
+            amount = 0
+            print(f"Error getting skin price: {e}")
+        try:
+            self.master.after(0, self.priceReady, amount)
+        except RuntimeError:
+            # The window was closed before the price came back
+            pass
+    
+    def priceReady(self, amount):
+        """Show the fetched price once it is back on the Tk thread."""
+        self.amount = amount
+        self.updateLabel()
     
     
     def updateLabel(self, *args):
         """Update the label when a new currency is selected."""
-        vp, format_string, price = CURRENCY_MAP[self.menu.get()]
-        total = round(self.amount * vp * price)
-        self.text.config(text=f"Current Amount for Skins: {format_string.format(total).rstrip('0').rstrip('.')}")
+        self.text.config(text=f"Current Amount for Skins: {self.getCurrency()}")
 
     def getCurrency(self, *args):
         """Get the amount of MONEY for different currency types."""
-        vp, format_string, price = CURRENCY_MAP[self.menu.get()]
-        total = round(self.amount * vp * price)
-        return format_string.format(total).rstrip('0').rstrip('.')
+        if self.amount is None:
+            return "Loading..."
+        return formatAmount(self.amount, self.menu.get())
 
 
 if __name__ == "__main__":
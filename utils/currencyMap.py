@@ -1,15 +1,28 @@
+from functools import lru_cache
+
 CURRENCY_MAP = {
-    "United States Dollar ($)": (1/11000, "${:,.0f}", 99.99),
-    "Australian Dollar (A$)": (1/9750, "A${:,.2f}", 129.99),
-    "Brazilian Real (R$)": (1/11500, "R${:,.2f}", 349.9),
-    "Canadian Dollar (CA$)": (1/11000, "CA${:,.2f}", 139.99),
-    "Euro (€)": (1/11000, "€{:,.2f}", 100),
-    "Indian Rupee (₹)": (1/11000, "₹{:,.2f}", 7900),
-    "Malaysian Ringgit (MYR)": (1/6750, "MYR{:,.2f}", 199.90),
-    "Mexican Dollar (MX$)": (1/12400, "MX${:,.2f}", 1999),
-    "New Zealand Dollar (NZ$)": (1/9750, "NZ${:,.2f}", 144.99),
-    "Russian Ruble (₽)": (1/11000, "₽{:,.2f}", 5990),
-    "Singapore Dollar (SGD)": (1/10500, "SGD{:,.2f}", 128.98),
-    "Turkish Lira (₺)": (1/8500, "₺{:,.2f}", 700),
-    "Pound Sterling (£)": (1/11500, "£{:,.2f}", 90)
+    "United States Dollar ($)": (1/11000, "${:,}", 99.99),
+    "Australian Dollar (A$)": (1/9750, "A${:,}", 129.99),
+    "Brazilian Real (R$)": (1/11500, "R${:,}", 349.9),
+    "Canadian Dollar (CA$)": (1/11000, "CA${:,}", 139.99),
+    "Euro (€)": (1/11000, "€{:,}", 100),
+    "Indian Rupee (₹)": (1/11000, "₹{:,}", 7900),
+    "Malaysian Ringgit (MYR)": (1/6750, "MYR{:,}", 199.90),
+    "Mexican Dollar (MX$)": (1/12400, "MX${:,}", 1999),
+    "New Zealand Dollar (NZ$)": (1/9750, "NZ${:,}", 144.99),
+    "Russian Ruble (₽)": (1/11000, "₽{:,}", 5990),
+    "Singapore Dollar (SGD)": (1/10500, "SGD{:,}", 128.98),
+    "Turkish Lira (₺)": (1/8500, "₺{:,}", 700),
+    "Pound Sterling (£)": (1/11500, "£{:,}", 90)
 }
+
+# Money per VP in each currency, folded together once since the rates never change
+VP_RATES = {currency: (vp * price, format_string) for currency, (vp, format_string, price) in CURRENCY_MAP.items()}
+
+
+@lru_cache(maxsize=64)
+def formatAmount(amount, currency):
+    """Format an amount of VP as money in the given currency."""
+    rate, format_string = VP_RATES[currency]
+    total = round(amount * rate)
+    return format_string.format(total)
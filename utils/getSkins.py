@@ -1,41 +1,200 @@
-import requests, lxml, re
-from bs4 import BeautifulSoup
+import json, os, tempfile, time
+from functools import lru_cache, wraps
+from pathlib import Path
 
-def getPrice():
+VP_URL = "https://valorant.fandom.com/wiki/Weapon_Skins"
+REQUEST_TIMEOUT = 10
+
+# Sent with every request to the wiki. Accept-Encoding is left to requests so it only offers what it can decode
+HEADERS = {
+    "User-Agent": "Valorant-Skin-Prices (https://github.com/Waerr/Valorant-Skin-Prices)",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+# Scraped totals are kept on disk so warm launches skip the network and the parse
+CACHE_FILE = Path.home() / ".cache" / "valorant_skins" / "prices.json"
+CACHE_TTL = 24 * 60 * 60
+
+# Thousands separators the wiki puts between the digit groups of its prices
+PRICE_GROUP_SEPARATORS = frozenset(",\xa0")
+
+# Cheapest and dearest skin prices in VP, anything read from cell text outside of these isn't a price
+MIN_SKIN_PRICE = 800
+MAX_SKIN_PRICE = 6000
+
+
+def readCache():
+    """Return the cached entry for VP_URL, or None if there isn't a usable one."""
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            cache = json.load(f)
+        if not isinstance(cache["ts"], (int, float)) or not isinstance(cache["amount"], int):
+            raise ValueError("malformed price cache entry")
+        # The validators go straight into request headers, where anything but a string is rejected
+        if not all(isinstance(cache.get(key), (str, type(None))) for key in ("etag", "lastModified")):
+            raise ValueError("malformed price cache validators")
+        if cache["url"] != VP_URL:
+            return None
+        return cache
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError):
+        # A corrupt cache would be re-read and rejected on every launch, so drop it and let the next scrape rewrite it
+        try:
+            CACHE_FILE.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Error removing corrupt price cache: {e}")
+        return None
+    except OSError as e:
+        print(f"Error reading price cache: {e}")
+        return None
+
+
+def writeCache(entry):
+    """Atomically store a scraped entry so concurrent launches never see a partial file."""
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Every writer gets its own temp file so two launches scraping at once can't mix their writes
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({**entry, "url": VP_URL, "ts": time.time()}, f)
+            os.replace(tmp_file, CACHE_FILE)
+        except OSError:
+            os.unlink(tmp_file)
+            raise
+    except OSError as e:
+        print(f"Error writing price cache: {e}")
+
+
+def refreshCache():
+    """Drop the cached amount so the next getPrice() scrapes again."""
+    CACHE_FILE.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=None)
+def getSession():
+    """Create the one requests session every scrape goes through, so connections to the wiki are kept alive."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    # requests advertises Accept-Encoding: br on its own when Brotli is installed, which shrinks the page download the most
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2))
+    return session
+
+
+@lru_cache(maxsize=None)
+def priceCells():
+    """Compile the XPath for the first td with a data-sort-value in each row of a table."""
+    from lxml import etree
+    return etree.XPath(".//tr/td[@data-sort-value][1]")
+
+
+def isSortableWikitable(table):
+    """Check whether a table element has both the wikitable and sortable classes."""
+    classes = table.get("class", "").split()
+    return "wikitable" in classes and "sortable" in classes
+
+
+def priceFromText(td_element):
+    """Read the price a cell's text starts with, for the rare rows whose data-sort-value isn't a plain number."""
+    text = "".join(td_element.itertext()).strip()
+    digits = []
+    for i, char in enumerate(text):
+        if char.isdecimal():
+            digits.append(char)
+        elif digits and char in PRICE_GROUP_SEPARATORS and text[i + 1:i + 2].isdecimal():
+            # A separator only continues the number when another digit group follows it
+            continue
+        elif digits and char.isspace():
+            # Whitespace ends the price, so "1,775 VP" or a cell holding several prices yields the first one
+            break
+        else:
+            # Text before the number or glued to it means the cell is a name, year, count or note, not a price
+            return None
+    if not digits:
+        return None
+    price = int("".join(digits))
+    return price if MIN_SKIN_PRICE <= price <= MAX_SKIN_PRICE else None
+
+
+def cachedPrice(func):
+    """Serve the wrapped scrape from the disk cache while it is younger than CACHE_TTL.
+    
+    Once the cache is stale the scrape is handed the old entry so it can revalidate it with the server.
+    """
+    @wraps(func)
+    def wrapper():
+        cache = readCache()
+        # A timestamp from the future means the clock was ahead when it was written, so it isn't trusted as fresh
+        if cache and 0 <= time.time() - cache["ts"] < CACHE_TTL:
+            return cache["amount"]
+        entry = func(cache)
+        writeCache(entry)
+        return entry["amount"]
+    return wrapper
+
+
+@cachedPrice
+def getPrice(cache=None):
     """HANDLES THE PRICE OF ALL THE SKINS IN VP"""
     
-    # THANKS TO VALORANT FANDOM FOR THE VP DATA <3
-    vp_url = "https://valorant.fandom.com/wiki/Weapon_Skins"
-    vp_html = requests.get(vp_url).text
-    vp_soup = BeautifulSoup(vp_html, "lxml")
+    # The scraping stack is only imported on a cache miss to keep startup fast
+    from lxml import etree
     
+    # THANKS TO VALORANT FANDOM FOR THE VP DATA <3
+    # Ask for the page only if it changed since the cached total was scraped
+    headers = {}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache and cache.get("lastModified"):
+        headers["If-Modified-Since"] = cache["lastModified"]
     
-    # Find the tables with class fandom-table and extract the prices from the 6th column of each row
-    vp_rows = vp_soup.select("table.wikitable.sortable")[1].find_all("tr")[1:]
+    # Stream the response straight into the parser instead of building the whole page as a string first
     vp_prices = []
-    for row in vp_rows:
-        td_element = row.find("td", {"data-sort-value": True})
-        if td_element:
-            price_text = re.sub("[\xa0\n,]", "", td_element.text.strip())
-            try:
-                price = int(price_text)
-                vp_prices.append(price)
-            except ValueError:
-                pass
-        else:
-            pass
-
-    # Legacy items are those not returning back to the store eg. "Champions Bundle"
-    # Find the table with class fandom-table and extract the prices from the Notes column
-    # legacy_table = vp_soup.find_all("div", class_="wds-tab__content")[3]
-    # legacy_rows = legacy_table.select("table.fandom-table")[0].find_all("tr")[1:]
-    
-    # Regex to find the Price from the Notes Column as an int
-    # legacy_prices = [int(''.join(filter(str.isdigit, re.findall(r'\d{1,3}(?:,\d{3})+', 
-    #                 row.find_all("td")[3].text.strip())[0]))) 
-    #                 for row in legacy_rows if re.findall(r'\d{1,3}(?:,\d{3})+', row.find_all("td")[3].text.strip())]  
-    # legacy_prices = [int(price) for price in legacy_prices]
-    
+    with getSession().get(VP_URL, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        if response.status_code == 304:
+            return cache
+        response.raise_for_status()
+        validators = {"etag": response.headers.get("ETag"), "lastModified": response.headers.get("Last-Modified")}
+        response.raw.decode_content = True
+        # Let lxml read the page's <meta charset> unless the server names an encoding itself
+        encoding = response.encoding if "charset" in response.headers.get("Content-Type", "") else None
+        
+        # Parse the page table by table and free each one once it has been looked at,
+        # so only the table being read is ever held in memory
+        sortable_tables = 0
+        # Whitespace-only text and comments never hold a price, so the parser doesn't build nodes for them
+        for _, table in etree.iterparse(response.raw, tag="table", html=True, encoding=encoding,
+                                        remove_blank_text=True, remove_comments=True, remove_pis=True):
+            if isSortableWikitable(table):
+                sortable_tables += 1
+                
+                # The skin prices are in the second sortable wikitable. The data-sort-value of the price
+                # cell already holds the plain number, so the cell text is only a fallback
+                if sortable_tables == 2:
+                    for td_element in priceCells()(table):
+                        sort_value = td_element.get("data-sort-value")
+                        if sort_value.isdecimal():
+                            vp_prices.append(int(sort_value))
+                        else:
+                            price = priceFromText(td_element)
+                            if price is not None:
+                                vp_prices.append(price)
+                    
+                    # Nothing after this table is needed, so stop parsing and downloading the rest of the page
+                    break
+            
+            # Tables nested in a cell close before the table around them has been read,
+            # so only top-level tables are freed
+            if next(table.iterancestors("table"), None) is None:
+                table.clear()
+                while table.getprevious() is not None:
+                    del table.getparent()[0]
     
+    if not vp_prices:
+        raise ValueError("No skin prices found on the wiki page")
     
-    return (sum(vp_prices))
\ No newline at end of file
+    return {"amount": sum(vp_prices), **validators}
\ No newline at end of file